@@ -3,6 +3,7 @@ from flask_cors import CORS
 from werkzeug.utils import secure_filename
 import os
 from model import ResumeScreeningModel
+from results_store import ResultStore, RescoreJob
 from utils import extract_text_from_pdf, extract_text_from_docx, preprocess_text
 
 app = Flask(__name__)
@@ -12,6 +13,7 @@ CORS(app)
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc'}
 MAX_FILE_SIZE = 16 * 1024 * 1024  # 16MB
+RESULTS_STORE = 'data/screening_results.jsonl'
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
@@ -22,6 +24,20 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 # Initialize the ML model
 model = ResumeScreeningModel()
 
+# Stored screening results and the job that keeps them in sync with the model config
+store = ResultStore(RESULTS_STORE)
+rescore_job = RescoreJob(model, store)
+
+@app.before_request
+def start_startup_rescore():
+    """
+    Weights, thresholds and skill lists are source constants, so refresh stored
+    results once per serving process, on its first request. Doing it here rather
+    than at import keeps threads out of gunicorn's --preload master, the debug
+    reloader's parent and tools like `flask routes`.
+    """
+    rescore_job.start_once()
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
@@ -77,11 +93,13 @@ def screen_resume():
             return jsonify({'success': False, 'error': 'Could not extract text from resume'}), 400
         
         # Analyze resume
-        result = model.analyze_resume(resume_text, job_description)
+        record = model.score_resume(resume_text, job_description)
+        result_id = store.add(record)
         
         return jsonify({
             'success': True,
-            **result
+            'result_id': result_id,
+            **record['result']
         }), 200
         
     except Exception as e:
@@ -95,6 +113,9 @@ def train_model():
     """Optional endpoint to train/retrain the model"""
     try:
         model.train_model()
+        # The vectorizer changed, so refresh the semantic scores of stored results
+        # (queued behind the current pass if one is running)
+        rescore_job.start()
         return jsonify({
             'success': True,
             'message': 'Model trained successfully'
@@ -105,6 +126,24 @@ def train_model():
             'error': f'Training failed: {str(e)}'
         }), 500
 
+@app.route('/api/rescore', methods=['POST'])
+def start_rescore():
+    """Recompute stored results whose config versions are out of date"""
+    started = rescore_job.start()
+    return jsonify({
+        'success': True,
+        'queued': not started,
+        'status': rescore_job.snapshot()
+    }), 202
+
+@app.route('/api/rescore', methods=['GET'])
+def rescore_status():
+    return jsonify({
+        'success': True,
+        'versions': model.config_versions(),
+        'status': rescore_job.snapshot()
+    }), 200
+
 if __name__ == '__main__':
     print("Resume Screening Bot API Starting...")
     print(f"Upload folder: {UPLOAD_FOLDER}")
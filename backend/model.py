@@ -1,13 +1,67 @@
 import pickle
 import os
+import json
+import hashlib
+import threading
 import numpy as np
+from sklearn.base import clone
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from utils import preprocess_text, extract_keywords, extract_skills, extract_experience
+from sklearn.exceptions import NotFittedError
+from sklearn.preprocessing import normalize
+from utils import preprocess_text, extract_keywords, extract_skills, extract_experience, SKILL_LIST
 import re
 
+# Order of the component scores in the weighting matrix
+COMPONENTS = ('skills', 'experience', 'semantic', 'role')
+
+SCORING_WEIGHTS = {
+    'skills': 0.40,
+    'experience': 0.25,
+    'semantic': 0.20,
+    'role': 0.15
+}
+
+# Critical skills (programming languages, frameworks)
+CRITICAL_KEYWORDS = ['python', 'java', 'javascript', 'react', 'angular', 'vue',
+                     'django', 'flask', 'spring', 'nodejs', 'aws', 'azure', 'gcp',
+                     'docker', 'kubernetes', 'sql', 'mongodb', 'postgresql']
+
+# Missing skills called out as critical in the improvement advice
+CRITICAL_ADVICE_KEYWORDS = ['python', 'java', 'react', 'aws']
+
+SKILL_VARIATIONS = {
+    'rest': ['restful', 'rest api', 'restapi'],
+    'nodejs': ['node.js', 'node js'],
+    'postgresql': ['postgres', 'psql'],
+    'kubernetes': ['k8s'],
+    'javascript': ['js'],
+    'typescript': ['ts'],
+}
+
+# Minimum final score for each recommendation tier
+RECOMMENDATION_THRESHOLDS = {
+    'strongly_recommended': 75,
+    'recommended': 60,
+    'consider': 45
+}
+
+def _fingerprint(data):
+    """Short stable hash of a JSON-serializable config value"""
+    payload = json.dumps(data, sort_keys=True).encode('utf-8')
+    return hashlib.sha1(payload).hexdigest()[:12]
+
 class ResumeScreeningModel:
     def __init__(self):
+        self.weights = dict(SCORING_WEIGHTS)
+        self.skill_list = list(SKILL_LIST)
+        self.critical_keywords = list(CRITICAL_KEYWORDS)
+        self.critical_advice_keywords = list(CRITICAL_ADVICE_KEYWORDS)
+        self.skill_variations = dict(SKILL_VARIATIONS)
+        self.thresholds = dict(RECOMMENDATION_THRESHOLDS)
+        self._vectorizer_version = None
+        # Guards swapping self.vectorizer; fits happen on a clone outside it, so
+        # scoring only holds it long enough to grab the current vectorizer
+        self._lock = threading.RLock()
         self.vectorizer = TfidfVectorizer(
             max_features=2000,
             stop_words='english',
@@ -25,6 +79,7 @@ class ResumeScreeningModel:
                 with open(self.model_path, 'rb') as f:
                     saved_data = pickle.load(f)
                     self.vectorizer = saved_data['vectorizer']
+                    self._vectorizer_version = None
                 print("Model loaded successfully")
             except Exception as e:
                 print(f"Error loading model: {e}")
@@ -37,6 +92,7 @@ class ResumeScreeningModel:
         os.makedirs('models', exist_ok=True)
         with open(self.model_path, 'wb') as f:
             pickle.dump({'vectorizer': self.vectorizer}, f)
+        self._vectorizer_version = None
         print("Model saved successfully")
     
     def train_model(self):
@@ -48,10 +104,41 @@ class ResumeScreeningModel:
             "Data scientist with expertise in Python, TensorFlow, scikit-learn, and statistical analysis.",
             "Full stack developer proficient in JavaScript, Node.js, React, MongoDB, and Docker."
         ]
-        self.vectorizer.fit(sample_resumes)
-        self.save_model()
+        # Fit a fresh copy and swap it in, so a rescoring batch never sees a half-fitted vectorizer
+        vectorizer = clone(self.vectorizer)
+        vectorizer.fit(sample_resumes)
+        with self._lock:
+            self.vectorizer = vectorizer
+            self.save_model()
         print("Model training completed")
 
+    def config_versions(self):
+        """Version tags for the inputs of each recomputable part of a result"""
+        return {
+            'weights': _fingerprint(self.weights),
+            'skills': _fingerprint([self.skill_list, self.critical_keywords,
+                                   self.critical_advice_keywords, self.skill_variations]),
+            'semantic': self._get_vectorizer_version(),
+            'thresholds': _fingerprint(self.thresholds)
+        }
+
+    def _get_vectorizer_version(self, vectorizer=None):
+        """Fingerprint the fitted vocabulary and idf weights (cached per vectorizer until the next fit)"""
+        if vectorizer is None:
+            vectorizer = self.vectorizer
+        cached = self._vectorizer_version
+        if cached is not None and cached[0] is vectorizer:
+            return cached[1]
+        if not hasattr(vectorizer, 'vocabulary_'):
+            return 'unfitted'
+        digest = hashlib.sha1()
+        vocabulary = vectorizer.vocabulary_
+        digest.update(json.dumps(sorted(vocabulary, key=vocabulary.get)).encode('utf-8'))
+        if hasattr(vectorizer, 'idf_'):
+            digest.update(np.asarray(vectorizer.idf_, dtype=np.float64).tobytes())
+        self._vectorizer_version = (vectorizer, digest.hexdigest()[:12])
+        return self._vectorizer_version[1]
+
     def analyze_resume(self, resume_text, job_description):
         """
         Enhanced AI-powered analysis that evaluates:
@@ -60,27 +147,20 @@ class ResumeScreeningModel:
         3. Contextual understanding (20%)
         4. Role compatibility (15%)
         """
-        resume_processed = preprocess_text(resume_text)
-        job_processed = preprocess_text(job_description)
-
-        # Ensure vectorizer is fitted
-        try:
-            resume_vector = self.vectorizer.transform([resume_processed])
-            job_vector = self.vectorizer.transform([job_processed])
-        except:
-            self.vectorizer.fit([resume_processed, job_processed])
-            self.save_model()
-            resume_vector = self.vectorizer.transform([resume_processed])
-            job_vector = self.vectorizer.transform([job_processed])
+        return self.score_resume(resume_text, job_description)['result']
 
+    def score_resume(self, resume_text, job_description):
+        """
+        Run the full analysis and return a storable record holding the raw
+        component scores, the analyses they came from, the config versions
+        used and the API result built from them.
+        """
         # 1. Semantic similarity (contextual understanding)
-        semantic_similarity = cosine_similarity(resume_vector, job_vector)[0][0]
-        semantic_score = semantic_similarity * 100
+        semantic_scores, semantic_version = self._semantic_scores([resume_text], [job_description])
+        semantic_score = float(semantic_scores[0])
 
         # 2. Technical skills analysis
-        resume_skills = extract_skills(resume_text)
-        job_skills = extract_skills(job_description)
-        skills_analysis = self._analyze_skills(resume_skills, job_skills)
+        skills_analysis = self._skills_component(resume_text, job_description)
 
         # 3. Experience analysis
         experience_analysis = self._analyze_experience(resume_text, job_description)
@@ -88,22 +168,138 @@ class ResumeScreeningModel:
         # 4. Role compatibility analysis
         role_compatibility = self._analyze_role_compatibility(resume_text, job_description)
 
-        # Calculate weighted final score
-        weights = {
-            'skills': 0.40,
-            'experience': 0.25,
-            'semantic': 0.20,
-            'role': 0.15
+        record = {
+            'resume_text': resume_text,
+            'job_description': job_description,
+            'components': {
+                'skills': skills_analysis['score'],
+                'experience': experience_analysis['score'],
+                'semantic': semantic_score,
+                'role': role_compatibility['score']
+            },
+            'skills_analysis': skills_analysis,
+            'experience_analysis': experience_analysis,
+            'role_analysis': role_compatibility,
+            'versions': dict(self.config_versions(), semantic=semantic_version)
         }
 
-        final_score = (
-            weights['skills'] * skills_analysis['score'] +
-            weights['experience'] * experience_analysis['score'] +
-            weights['semantic'] * semantic_score +
-            weights['role'] * role_compatibility['score']
+        # Calculate weighted final score
+        final_score = float(self._weighted_scores([record])[0])
+        record['result'] = self._build_result(record, final_score)
+
+        print(f"[DEBUG] Scores - Skills: {skills_analysis['score']:.1f}, Experience: {experience_analysis['score']:.1f}, Semantic: {semantic_score:.1f}, Role: {role_compatibility['score']:.1f}, Final: {final_score}")
+
+        return record
+
+    def rescore_records(self, records):
+        """
+        Bring stored records up to date with the current config, in place.
+        Only the components whose input versions changed are recomputed;
+        the final scores are then re-weighted for the whole batch at once.
+        Returns the number of records that were updated.
+        """
+        # Only snapshot the config under the lock; the batch itself runs unlocked
+        with self._lock:
+            vectorizer = self.vectorizer
+            current = self.config_versions()
+        stale = [r for r in records if r.get('versions') != current]
+        if not stale:
+            return 0
+
+        # Skill list changes only re-run the skills component
+        for record in stale:
+            if record['versions'].get('skills') != current['skills']:
+                skills_analysis = self._skills_component(record['resume_text'], record['job_description'])
+                record['skills_analysis'] = skills_analysis
+                record['components']['skills'] = skills_analysis['score']
+
+        # Vectorizer changes only re-run the semantic component
+        semantic_stale = [r for r in stale if r['versions'].get('semantic') != current['semantic']]
+        if semantic_stale:
+            # Tag with the version of the vectorizer that produced the scores
+            semantic_scores, current['semantic'] = self._semantic_scores(
+                [r['resume_text'] for r in semantic_stale],
+                [r['job_description'] for r in semantic_stale],
+                vectorizer
+            )
+            for record, semantic_score in zip(semantic_stale, semantic_scores):
+                record['components']['semantic'] = float(semantic_score)
+
+        final_scores = self._weighted_scores(stale)
+        for record, final_score in zip(stale, final_scores):
+            record['result'] = self._build_result(record, float(final_score))
+            record['versions'] = dict(current)
+
+        return len(stale)
+
+    def _semantic_scores(self, resume_texts, job_descriptions, vectorizer=None):
+        """
+        Cosine similarity (0-100) between each resume and its job description,
+        plus the version of the vectorizer that produced it
+        """
+        resume_processed = [preprocess_text(t) for t in resume_texts]
+        job_processed = [preprocess_text(t) for t in job_descriptions]
+
+        if vectorizer is None:
+            with self._lock:
+                vectorizer = self.vectorizer
+
+        # Ensure vectorizer is fitted
+        try:
+            resume_vectors = vectorizer.transform(resume_processed)
+            job_vectors = vectorizer.transform(job_processed)
+        except NotFittedError:
+            vectorizer = self._fit_on_first_use(vectorizer, resume_processed + job_processed)
+            resume_vectors = vectorizer.transform(resume_processed)
+            job_vectors = vectorizer.transform(job_processed)
+        version = self._get_vectorizer_version(vectorizer)
+
+        # Row-wise cosine similarity of the paired vectors
+        similarity = normalize(resume_vectors).multiply(normalize(job_vectors)).sum(axis=1)
+        return np.asarray(similarity).ravel() * 100, version
+
+    def _fit_on_first_use(self, vectorizer, texts):
+        """Fit a copy of an unfitted vectorizer and swap it in, as train_model does"""
+        fitted = clone(vectorizer)
+        fitted.fit(texts)
+        with self._lock:
+            if self.vectorizer is vectorizer:
+                self.vectorizer = fitted
+                self.save_model()
+            else:
+                # Another request or training fitted one first; use that instead
+                fitted = self.vectorizer
+        return fitted
+
+    def _skills_component(self, resume_text, job_description):
+        """Extract skills from both texts and analyze them with the current skill config"""
+        resume_skills = extract_skills(resume_text, self.skill_list)
+        job_skills = extract_skills(job_description, self.skill_list)
+        return self._analyze_skills(resume_skills, job_skills)
+
+    def _weighted_scores(self, records):
+        """Weighted final scores for a batch of records"""
+        component_matrix = np.array(
+            [[record['components'][name] for name in COMPONENTS] for record in records],
+            dtype=np.float64
         )
+        weight_vector = np.array([self.weights[name] for name in COMPONENTS], dtype=np.float64)
+        weighted = component_matrix * weight_vector
+
+        # Sum the columns left to right, like the per-resume formula, so the
+        # totals match it bit for bit
+        totals = np.zeros(len(records))
+        for column in range(len(COMPONENTS)):
+            totals = totals + weighted[:, column]
 
-        final_score = min(100, round(final_score, 1))
+        # Python's round is correctly rounded; np.round can differ at x.x5
+        return [min(100, round(float(total), 1)) for total in totals]
+
+    def _build_result(self, record, final_score):
+        """Build the API result from a record's component analyses"""
+        skills_analysis = record['skills_analysis']
+        experience_analysis = record['experience_analysis']
+        role_compatibility = record['role_analysis']
 
         # Generate intelligent recommendation
         recommendation_data = self._generate_recommendation(
@@ -113,8 +309,6 @@ class ResumeScreeningModel:
             role_compatibility
         )
 
-        print(f"[DEBUG] Scores - Skills: {skills_analysis['score']:.1f}, Experience: {experience_analysis['score']:.1f}, Semantic: {semantic_score:.1f}, Role: {role_compatibility['score']:.1f}, Final: {final_score}")
-
         return {
             'match_score': final_score,
             'prediction': recommendation_data['prediction'],
@@ -129,13 +323,13 @@ class ResumeScreeningModel:
             'details': {
                 'skills_score': round(skills_analysis['score'], 1),
                 'experience_score': round(experience_analysis['score'], 1),
-                'semantic_score': round(semantic_score, 1),
+                'semantic_score': round(record['components']['semantic'], 1),
                 'role_score': round(role_compatibility['score'], 1),
                 'resume_years': experience_analysis['resume_years'],
                 'required_years': experience_analysis['required_years'],
                 'critical_skills_met': skills_analysis['critical_met'],
                 'total_skills_matched': len(skills_analysis['matched']),
-                'total_skills_required': len(job_skills)
+                'total_skills_required': skills_analysis['required']
             }
         }
     
@@ -144,16 +338,11 @@ class ResumeScreeningModel:
         matched = []
         missing = []
         
-        # Critical skills (programming languages, frameworks)
-        critical_keywords = ['python', 'java', 'javascript', 'react', 'angular', 'vue', 
-                            'django', 'flask', 'spring', 'nodejs', 'aws', 'azure', 'gcp',
-                            'docker', 'kubernetes', 'sql', 'mongodb', 'postgresql']
-        
         critical_matched = 0
         critical_required = 0
         
         for job_skill in job_skills:
-            is_critical = any(crit in job_skill.lower() for crit in critical_keywords)
+            is_critical = any(crit in job_skill.lower() for crit in self.critical_keywords)
             if is_critical:
                 critical_required += 1
             
@@ -187,7 +376,8 @@ class ResumeScreeningModel:
             'matched': matched,
             'missing': missing,
             'critical_met': critical_matched,
-            'critical_total': critical_required
+            'critical_total': critical_required,
+            'required': len(job_skills)
         }
     
     def _analyze_experience(self, resume_text, job_description):
@@ -274,19 +464,10 @@ class ResumeScreeningModel:
         skill1_lower = skill1.lower()
         skill2_lower = skill2.lower()
         
-        variations = {
-            'rest': ['restful', 'rest api', 'restapi'],
-            'nodejs': ['node.js', 'node js'],
-            'postgresql': ['postgres', 'psql'],
-            'kubernetes': ['k8s'],
-            'javascript': ['js'],
-            'typescript': ['ts'],
-        }
-        
         if skill1_lower == skill2_lower:
             return True
         
-        for key, vals in variations.items():
+        for key, vals in self.skill_variations.items():
             if (skill1_lower == key and skill2_lower in vals) or \
                (skill2_lower == key and skill1_lower in vals):
                 return True
@@ -316,22 +497,22 @@ class ResumeScreeningModel:
         if experience_analysis['score'] < 60:
             improvements.append(f"Gain more experience in the required domain")
         if len(skills_analysis['missing']) > 0:
-            critical_missing = [s for s in skills_analysis['missing'] if any(c in s.lower() for c in ['python', 'java', 'react', 'aws'])]
+            critical_missing = [s for s in skills_analysis['missing'] if any(c in s.lower() for c in self.critical_advice_keywords)]
             if critical_missing:
                 improvements.append(f"Critical skills missing: {', '.join(critical_missing[:3])}")
         
         # Determine recommendation
-        if score >= 75:
+        if score >= self.thresholds['strongly_recommended']:
             prediction = "Strongly Recommended"
             should_apply = True
             confidence = "High"
             recommendation = "Excellent match! Your skills and experience align very well with this position. You should definitely apply."
-        elif score >= 60:
+        elif score >= self.thresholds['recommended']:
             prediction = "Recommended"
             should_apply = True
             confidence = "Medium-High"
             recommendation = "Good match! You meet most requirements. Apply and highlight your relevant experience."
-        elif score >= 45:
+        elif score >= self.thresholds['consider']:
             prediction = "Consider Applying"
             should_apply = True
             confidence = "Medium"
@@ -0,0 +1,254 @@
+import json
+import os
+import tempfile
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no inter-process locking, so run a single worker process
+    fcntl = None
+
+@contextmanager
+def _file_lock(lock_path):
+    """Exclusive inter-process lock held on lock_path"""
+    if fcntl is None:
+        yield
+        return
+    with open(lock_path, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+class ResultStore:
+    """
+    Append-only JSON Lines store of screening records. Writes are guarded by
+    a lock file next to the store so several worker processes can share it.
+    """
+
+    def __init__(self, path='data/screening_results.jsonl'):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+
+    @contextmanager
+    def _locked(self):
+        with self._lock, _file_lock(self.path + '.lock'):
+            yield
+
+    @contextmanager
+    def rescore_lock(self):
+        """Serialize rescoring passes across processes"""
+        with _file_lock(self.path + '.rescore.lock'):
+            yield
+
+    def make_temp_file(self):
+        """Create a unique temp file beside the store (so os.replace stays atomic)"""
+        return tempfile.mkstemp(
+            dir=os.path.dirname(self.path) or '.',
+            prefix=os.path.basename(self.path) + '.',
+            suffix='.tmp'
+        )
+
+    def add(self, record):
+        """Append a screening record and return its id"""
+        record = dict(record)
+        record.setdefault('id', uuid.uuid4().hex)
+        record.setdefault('created_at', datetime.now(timezone.utc).isoformat())
+        line = (json.dumps(record) + "\n").encode('utf-8')
+        with self._locked():
+            with open(self.path, 'ab+') as f:
+                # Terminate a line left partial by a crashed write, so it doesn't swallow this one
+                f.seek(0, os.SEEK_END)
+                if f.tell() > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        line = b"\n" + line
+                f.write(line)
+        return record['id']
+
+    def size(self):
+        """Current size of the store in bytes"""
+        with self._locked():
+            return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    def iter_batches(self, batch_size, end_offset, on_invalid=None):
+        """
+        Stream records in batches, reading only up to end_offset bytes. Lines
+        that don't parse (e.g. truncated by a crash) are skipped and passed
+        to on_invalid.
+        """
+        if not os.path.exists(self.path):
+            return
+        batch = []
+        with open(self.path, 'rb') as f:
+            while f.tell() < end_offset:
+                offset = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    batch.append(json.loads(line))
+                except ValueError as e:
+                    print(f"Skipping unreadable record at byte {offset} of {self.path}: {e}")
+                    if on_invalid:
+                        on_invalid(line)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def quarantine(self, lines):
+        """Keep unreadable lines in a side file so a rewrite doesn't lose them"""
+        with self._locked():
+            with open(self.path + '.rejected', 'ab') as f:
+                for line in lines:
+                    f.write(line if line.endswith(b"\n") else line + b"\n")
+
+    def replace(self, tmp_path, end_offset):
+        """
+        Swap in a rewritten copy of the first end_offset bytes, carrying over
+        any records appended since the rewrite started.
+        """
+        with self._locked():
+            with open(self.path, 'rb') as src, open(tmp_path, 'ab') as dst:
+                src.seek(end_offset)
+                for line in src:
+                    dst.write(line)
+            os.replace(tmp_path, self.path)
+
+
+class RescoreJob:
+    """Background job that streams the store through ResumeScreeningModel.rescore_records"""
+
+    def __init__(self, model, store, batch_size=256):
+        self.model = model
+        self.store = store
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._running = False
+        self._pending = False
+        self._started_once = False
+        self._pid = os.getpid()
+        self._status = {
+            'state': 'idle',
+            'processed': 0,
+            'updated': 0,
+            'rejected': 0,
+            'started_at': None,
+            'finished_at': None,
+            'error': None
+        }
+
+    def _check_fork(self):
+        """Reset run flags in a forked child; the pass thread doesn't survive a fork"""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._running = False
+            self._pending = False
+            self._started_once = False
+
+    def is_running(self):
+        with self._lock:
+            self._check_fork()
+            return self._running
+
+    def start_once(self):
+        """Start a pass unless this process has already started one via start_once"""
+        with self._lock:
+            self._check_fork()
+            if self._started_once:
+                return False
+            self._started_once = True
+        return self.start()
+
+    def start(self):
+        """
+        Start a rescoring pass. If one is already running, queue another to
+        start when it ends (the config may have changed mid-pass) and return False.
+        """
+        with self._lock:
+            self._check_fork()
+            if self._running:
+                self._pending = True
+                return False
+            self._running = True
+            self._reset_status()
+        threading.Thread(target=self._run, daemon=True).start()
+        return True
+
+    def snapshot(self):
+        """Consistent copy of the status of the current or last pass"""
+        with self._lock:
+            return dict(self._status)
+
+    def _update_status(self, **fields):
+        with self._lock:
+            self._status.update(fields)
+
+    def _reset_status(self):
+        # Caller holds self._lock
+        self._status.update({
+            'state': 'running',
+            'processed': 0,
+            'updated': 0,
+            'rejected': 0,
+            'started_at': datetime.now(timezone.utc).isoformat(),
+            'finished_at': None,
+            'error': None
+        })
+
+    def _run(self):
+        while True:
+            self._run_pass()
+            with self._lock:
+                if not self._pending:
+                    self._running = False
+                    return
+                self._pending = False
+                self._reset_status()
+
+    def _run_pass(self):
+        tmp_path = None
+        rejected = []
+        processed = 0
+        updated = 0
+        state, error = 'completed', None
+        try:
+            # Another worker's pass rewrites the same file, so wait for it to finish
+            with self.store.rescore_lock():
+                end_offset = self.store.size()
+                fd, tmp_path = self.store.make_temp_file()
+                with os.fdopen(fd, 'w', encoding='utf-8') as out:
+                    for batch in self.store.iter_batches(self.batch_size, end_offset, rejected.append):
+                        updated += self.model.rescore_records(batch)
+                        for record in batch:
+                            out.write(json.dumps(record) + "\n")
+                        processed += len(batch)
+                        self._update_status(processed=processed, updated=updated)
+
+                self._update_status(rejected=len(rejected))
+                # Move unreadable lines out of the store, or leave it untouched if nothing changed
+                if rejected:
+                    self.store.quarantine(rejected)
+                if updated > 0 or rejected:
+                    self.store.replace(tmp_path, end_offset)
+        except Exception as e:
+            print(f"Rescoring failed: {e}")
+            state, error = 'failed', str(e)
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self._update_status(
+                state=state,
+                error=error,
+                finished_at=datetime.now(timezone.utc).isoformat()
+            )
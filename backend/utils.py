@@ -116,24 +116,27 @@ def extract_keywords(text, top_n=100):
     
     return list(keywords)
 
-def extract_skills(text):
+# Primary technical skills
+SKILL_LIST = [
+    'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'ruby', 'php',
+    'go', 'rust', 'kotlin', 'swift', 'scala', 'sql', 'html', 'css',
+    'react', 'angular', 'vue', 'django', 'flask', 'spring', 'nodejs',
+    'express', 'fastapi', 'nextjs', 'laravel', 'rails',
+    'postgresql', 'mysql', 'mongodb', 'redis', 'cassandra', 'elasticsearch',
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'gitlab',
+    'terraform', 'ansible', 'ci/cd', 'git',
+    'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy',
+    'rest', 'restful', 'api', 'graphql', 'microservices', 'websocket',
+    'agile', 'scrum', 'devops', 'tdd', 'linux', 'bash'
+]
+
+def extract_skills(text, skill_list=None):
     """Extract technical skills from text"""
     skills = set()
     text_lower = text.lower()
     
-    # Primary technical skills
-    skill_list = [
-        'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'ruby', 'php',
-        'go', 'rust', 'kotlin', 'swift', 'scala', 'sql', 'html', 'css',
-        'react', 'angular', 'vue', 'django', 'flask', 'spring', 'nodejs',
-        'express', 'fastapi', 'nextjs', 'laravel', 'rails',
-        'postgresql', 'mysql', 'mongodb', 'redis', 'cassandra', 'elasticsearch',
-        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'gitlab',
-        'terraform', 'ansible', 'ci/cd', 'git',
-        'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy',
-        'rest', 'restful', 'api', 'graphql', 'microservices', 'websocket',
-        'agile', 'scrum', 'devops', 'tdd', 'linux', 'bash'
-    ]
+    if skill_list is None:
+        skill_list = SKILL_LIST
     
     for skill in skill_list:
         pattern = re.escape(skill)